@@ -8,143 +8,503 @@ This version preserves all whitespace and blank lines to allow exact reconstruct
 
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+import mmap
+import os
+from array import array
 import argparse
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Union
 import sys
 import traceback
 
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+try:
+    import re2  # Optional: linear-time regex engine for the document-wide tag scan
+except ImportError:
+    re2 = None
+
 sys.setrecursionlimit(10000)
 
+# Whitespace allowed around CSS tokens, matched the same way by str and bytes patterns
+CSS_WHITESPACE = r'[ \t\r\n\f\v]'
+
+
+def _json_dumps(obj) -> bytes:
+    """Encode `obj` as UTF-8 JSON, with orjson when available."""
+    # orjson serializes dataclasses natively; json needs them as dicts
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, default=asdict).encode('utf-8')
+
+
+@dataclass
+class Chunk:
+    """One page of the split document, serialized as a JSON object per chunk."""
+    # Declared by hand rather than with slots=True, which needs Python 3.10. Not frozen:
+    # pickle and copy restore slot state through __setattr__, which frozen forbids
+    __slots__ = ('page', 'content', 'has_break_before', 'break_element_info')
+
+    page: int
+    content: str
+    has_break_before: bool
+    break_element_info: Union[str, Dict]
+
 
 class HTMLPageBreakSplitter:
-    def __init__(self):
+    def __init__(self, use_re2: bool = False):
+        if use_re2 and re2 is None:
+            raise ImportError("use_re2 requires the google-re2 package")
+        # Not `\s`, which matches U+00A0 and other Unicode spaces in str patterns only.
+        # str patterns are also compiled with re.ASCII so that, like the bytes patterns,
+        # they do not fold case with Unicode rules (e.g. 'ſ' matching 's')
+        ws = CSS_WHITESPACE
+
         # Patterns for page break indicators (case-insensitive)
         self.page_break_patterns = [
-            r'page-break-before\s*:\s*always',
-            r'page-break-after\s*:\s*always',
-            r'break-before\s*:\s*page',
-            r'break-after\s*:\s*page',
-            r'break-before\s*:\s*always',
-            r'break-after\s*:\s*always'
+            f'page-break-before{ws}*:{ws}*always',
+            f'page-break-after{ws}*:{ws}*always',
+            f'break-before{ws}*:{ws}*page',
+            f'break-after{ws}*:{ws}*page',
+            f'break-before{ws}*:{ws}*always',
+            f'break-after{ws}*:{ws}*always'
         ]
         
         # Patterns for break avoidance
         self.break_avoidance_patterns = [
-            r'page-break-inside\s*:\s*avoid',
-            r'break-inside\s*:\s*avoid',
-            r'page-break-before\s*:\s*avoid',
-            r'page-break-after\s*:\s*avoid',
-            r'break-before\s*:\s*avoid',
-            r'break-after\s*:\s*avoid'
+            f'page-break-inside{ws}*:{ws}*avoid',
+            f'break-inside{ws}*:{ws}*avoid',
+            f'page-break-before{ws}*:{ws}*avoid',
+            f'page-break-after{ws}*:{ws}*avoid',
+            f'break-before{ws}*:{ws}*avoid',
+            f'break-after{ws}*:{ws}*avoid'
         ]
         
-        self.break_regex = re.compile(
-            '|'.join(f'({pattern})' for pattern in self.page_break_patterns),
-            re.IGNORECASE
+        # Break and avoid properties in one alternation so a style is scanned once
+        self.break_property_regex = re.compile(
+            '(?P<avoid>' + '|'.join(self.break_avoidance_patterns) + ')|'
+            '(?P<page_break>' + '|'.join(self.page_break_patterns) + ')',
+            re.IGNORECASE | re.ASCII
         )
-        self.avoid_regex = re.compile(
-            '|'.join(f'({pattern})' for pattern in self.break_avoidance_patterns),
-            re.IGNORECASE
+        # Any tag with an inline style; break/avoid rules are checked on the style value only.
+        # The lazy prefix takes the first `style=` and the preceding separator keeps
+        # attributes such as `data-style` from being read as the style.
+        def tag_regex(style_word):
+            return rf'<(?P<tag>[^>]*?[ \t\r\n\f\v"\'/]{style_word}{ws}*={ws}*["\'](?P<style>[^"\']*)["\'][^>]*)>'
+
+        self.tag_pattern = re.compile(tag_regex('style'), re.IGNORECASE | re.DOTALL | re.ASCII)
+        # Every break and avoid property contains 'break'; documents without it have no breaks
+        self.break_word_regex = re.compile(r'break', re.IGNORECASE | re.ASCII)
+        # Bytes versions for scanning a memory-mapped file; the CSS properties are ASCII
+        self.break_property_bytes_regex = re.compile(
+            self.break_property_regex.pattern.encode('ascii'), re.IGNORECASE | re.ASCII
         )
-
-    def split_html_by_regex(self, html_content: str) -> List[Dict]:
-        """Split HTML content into chunks, preserving all whitespace and blank lines."""
-        # Find all page break indicators
-        break_positions = []
-
-        tag_pattern = re.compile(
-            r'<([^>]*style\s*=\s*["\'][^"\']*(?:' +
-            '|'.join(self.page_break_patterns) +
-            r')[^"\']*["\'][^>]*)>',
-            re.IGNORECASE | re.DOTALL
+        self.tag_bytes_pattern = re.compile(
+            self.tag_pattern.pattern.encode('ascii'), re.IGNORECASE | re.DOTALL | re.ASCII
         )
+        # Named groups of a bytes RE2 pattern are keyed by bytes, so read the style by index
+        self.style_group = self.tag_pattern.groupindex['style']
+        if use_re2:
+            # RE2 cannot backtrack, so pathological style attributes scan in linear time;
+            # on ordinary documents it is slower than re, hence opt-in. RE2 always folds
+            # case with Unicode rules, so the attribute name is spelled out in ASCII
+            re2_tag_regex = '(?s)' + tag_regex('[Ss][Tt][Yy][Ll][Ee]')
+            self.tag_pattern = re2.compile(re2_tag_regex)
+            self.tag_bytes_pattern = re2.compile(re2_tag_regex.encode('ascii'))
+        self.head_open_bytes_regex = re.compile(rb'<head', re.IGNORECASE | re.ASCII)
+        self.head_close_bytes_regex = re.compile(rb'</head>', re.IGNORECASE | re.ASCII)
+        self.break_word_bytes_regex = re.compile(rb'break', re.IGNORECASE | re.ASCII)
+        # Bounds of the <head> element, used when streaming
+        self.head_open_regex = re.compile(r'<head', re.IGNORECASE | re.ASCII)
+        self.head_close_regex = re.compile(r'</head>', re.IGNORECASE | re.ASCII)
+
+    def _is_page_break(self, style) -> bool:
+        """Return True if an inline style (str or bytes) forces a page break and does not avoid one."""
+        if isinstance(style, bytes):
+            needle, regex = b'break', self.break_property_bytes_regex
+        else:
+            needle, regex = 'break', self.break_property_regex
+        # Every break and avoid property contains 'break'; most styles have none
+        if needle not in style.lower():
+            return False
+        has_break = False
+        for match in regex.finditer(style):
+            if match.lastgroup == 'avoid':
+                return False
+            has_break = True
+        return has_break
+
+    @staticmethod
+    def _trimmed_end(html_content: str, start: int, end: int, window: int = 64) -> int:
+        """Return `end` moved back over trailing whitespace, but not past `start`."""
+        # Strip a short tail window so long chunks are not copied just to trim them
+        while True:
+            window_start = max(start, end - window)
+            tail = html_content[window_start:end].rstrip(' \t\r\n')
+            if tail or window_start == start:
+                return window_start + len(tail)
+            end = window_start  # Whole window was whitespace, keep walking back
+
+    def _break_positions(self, data, word_regex, tag_regex, end: int = None) -> List:
+        """Return `(position, tag)` for every page break tag in `data[:end]`, in document order.
+
+        `data` is str, bytes or an mmap, scanned with the matching `word_regex` /
+        `tag_regex` pair. The tag scan is skipped when 'break' never occurs.
+        """
+        if end is None:
+            end = len(data)
+        if not word_regex.search(data, 0, end):
+            return []
+        return [
+            (match.start(), match.group())
+            for match in tag_regex.finditer(data, 0, end)
+            if self._is_page_break(match.group(self.style_group))
+        ]
 
-        for match in tag_pattern.finditer(html_content):
-            tag_content = match.group(1)
-            if not self.avoid_regex.search(tag_content):
-                break_positions.append((match.start(), match.group()))
+    def split_html_by_regex_offsets(self, html_content: str) -> Dict:
+        """Locate chunk boundaries without copying chunk content.
 
-        break_positions.sort(key=lambda x: x[0])
+        Returns parallel sequences `pages`, `starts`, `ends` and `break_infos`;
+        chunk i is `html_content[starts[i]:ends[i]]`.
+        """
+        break_positions = self._break_positions(html_content, self.break_word_regex, self.tag_pattern)
+
+        pages = array('q')
+        starts = array('q')
+        ends = array('q')
+        break_infos = []
 
         if not break_positions:
-            return [{
-                'page': 1,
-                'content': html_content,
-                'has_break_before': False,
-                'break_element_info': 'No breaks found'
-            }]
-
-        chunks = []
+            pages.append(1)
+            starts.append(0)
+            ends.append(len(html_content))
+            break_infos.append('No breaks found')
+            return {'pages': pages, 'starts': starts, 'ends': ends, 'break_infos': break_infos}
+
         last_pos = 0
 
         for page_num, (break_pos, break_text) in enumerate(break_positions, 1):
-            # Include any trailing whitespace before the break in the previous chunk
-            temp_break_pos = break_pos
-            while temp_break_pos > last_pos and html_content[temp_break_pos - 1] in ('\n', '\r', ' ', '\t'):
-                temp_break_pos -= 1
-
-            chunk_content = html_content[last_pos:temp_break_pos]
-
-            chunks.append({
-                'page': page_num,
-                'content': chunk_content,
-                'has_break_before': page_num > 1,
-                'break_element_info': {
-                    'break_text': break_text[:200],
-                    'position': break_pos
-                }
+            # Trim trailing whitespace before the break from the previous chunk
+            chunk_end = self._trimmed_end(html_content, last_pos, break_pos)
+
+            pages.append(page_num)
+            starts.append(last_pos)
+            ends.append(chunk_end)
+            break_infos.append({
+                'break_text': break_text[:200],
+                'position': break_pos
             })
 
             last_pos = break_pos  # Start next chunk at the page break tag
 
         # Add final chunk
-        final_chunk = html_content[last_pos:]
-        if final_chunk:
-            chunks.append({
-                'page': len(break_positions) + 1,
-                'content': final_chunk,
-                'has_break_before': True,
-                'break_element_info': 'Final chunk'
-            })
+        if last_pos < len(html_content):
+            pages.append(len(break_positions) + 1)
+            starts.append(last_pos)
+            ends.append(len(html_content))
+            break_infos.append('Final chunk')
 
-        return chunks
+        return {'pages': pages, 'starts': starts, 'ends': ends, 'break_infos': break_infos}
 
-    def process_file(self, input_file: str, output_file: str = None) -> str:
-        """Split HTML file and write JSON chunks."""
+    def split_html_by_regex(self, html_content: str) -> List[Chunk]:
+        """Split HTML content into chunks, preserving all whitespace and blank lines."""
+        offsets = self.split_html_by_regex_offsets(html_content)
+        return [
+            Chunk(page, html_content[start:end], page > 1, break_info)
+            for page, start, end, break_info in zip(
+                offsets['pages'], offsets['starts'], offsets['ends'], offsets['break_infos']
+            )
+        ]
+
+    @staticmethod
+    def _find_tag(data, literal, regex, start: int = 0) -> int:
+        """Case-insensitive find of a lowercase tag literal in str or bytes data.
+
+        The lower- and upper-case spellings are located with `find`; `regex` is only
+        run over the text before the first hit, to catch mixed-case spellings.
+        """
+        hits = [i for i in (data.find(literal, start), data.find(literal.upper(), start)) if i != -1]
+        end = min(hits) if hits else len(data)
+        match = regex.search(data, start, end)
+        if match:
+            return match.start()
+        return end if hits else -1
+
+    def _extract_head(self, data):
+        """Return the `<head>...</head>` slice of bytes data, or None.
+
+        Matches what a case-insensitive `<head.*?</head>` search would: from the
+        first '<head' to the first '</head>' after it.
+        """
+        start = self._find_tag(data, b'<head', self.head_open_bytes_regex)
+        if start == -1:
+            return None
+        end = self._find_tag(data, b'</head>', self.head_close_bytes_regex, start + len(b'<head'))
+        if end == -1:
+            return None
+        return data[start:end + len(b'</head>')]
+
+    @staticmethod
+    def _decode(data: bytes) -> str:
+        """Decode like a text-mode read: UTF-8 ignoring errors, universal newlines."""
+        return data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+    def split_file(self, input_file: str) -> tuple:
+        """Split an HTML file through mmap without decoding the whole document.
+
+        Break tags are located with bytes patterns and each chunk is decoded only
+        when it is emitted. Chunks always start at a '<', so decoding them one by
+        one gives the same text as decoding the whole file. Returns
+        `(file_size, head_content, chunks)`, with sizes and positions in characters
+        as `process_file` reports them.
+        """
+        with open(input_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                buf = b''  # mmap cannot map an empty file
+            else:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                head = self._extract_head(buf)
+                head_content = self._decode(head) if head is not None else ""
+
+                break_positions = self._break_positions(
+                    buf, self.break_word_bytes_regex, self.tag_bytes_pattern
+                )
+
+                # One slot per chunk, filled by index instead of growing the list
+                chunks = [None] * (len(break_positions) + 1)
+                last_pos = 0
+                char_pos = 0  # Position of buf[last_pos] in the decoded document
+
+                for page_num, (break_pos, break_text) in enumerate(break_positions, 1):
+                    segment = self._decode(buf[last_pos:break_pos])
+                    char_pos += len(segment)
+                    chunks[page_num - 1] = Chunk(
+                        page=page_num,
+                        content=segment.rstrip(' \t\r\n'),
+                        has_break_before=page_num > 1,
+                        break_element_info={
+                            'break_text': self._decode(break_text)[:200],
+                            'position': char_pos
+                        }
+                    )
+                    last_pos = break_pos
+
+                segment = self._decode(buf[last_pos:])
+                file_size = char_pos + len(segment)
+                if not break_positions or segment:
+                    chunks[-1] = Chunk(
+                        page=len(chunks),
+                        content=segment,
+                        has_break_before=bool(break_positions),
+                        break_element_info='Final chunk' if break_positions else 'No breaks found'
+                    )
+                else:
+                    chunks.pop()
+            finally:
+                if isinstance(buf, mmap.mmap):
+                    buf.close()
+
+        return file_size, head_content, chunks
+
+    def _check_input_file(self, input_file: str) -> Path:
+        """Validate that the input exists and is an HTML/HTM file."""
         input_path = Path(input_file)
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_file}")
         if input_path.suffix.lower() not in ['.html', '.htm']:
             raise ValueError("Input file must be an HTML or HTM file")
+        return input_path
+
+    def process_file(self, input_file: str, output_file: str = None) -> str:
+        """Split HTML file and write JSON chunks."""
+        input_path = self._check_input_file(input_file)
 
         if output_file is None:
             output_file = input_path.stem + '_chunks.json'
 
-        with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-            html_content = f.read()
+        file_size, head_content, chunks = self.split_file(str(input_path))
 
-        file_size = len(html_content)
+        metadata = {
+            'original_file': str(input_path),
+            'total_pages': len(chunks),
+            'file_size': file_size,
+            'parsing_method': 'regex',
+            'head_content': head_content
+        }
 
-        # Extract <head> if present
-        head_match = re.search(r'<head.*?</head>', html_content, re.DOTALL | re.IGNORECASE)
-        head_content = head_match.group(0) if head_match else ""
+        # Encode one chunk at a time so the whole JSON document is never built in memory
+        with open(output_file, 'wb') as f:
+            f.write(b'{"metadata": ' + _json_dumps(metadata) + b',\n"chunks": [')
+            for i, chunk in enumerate(chunks):
+                f.write(b',\n' if i else b'\n')
+                f.write(_json_dumps(chunk))
+            f.write(b'\n]}\n')
 
-        chunks = self.split_html_by_regex(html_content)
+        return output_file
+
+    @staticmethod
+    def chunk_output_paths(input_files: List[str], output_dir: str = None) -> List[str]:
+        """Return `<stem>_chunks.json` in `output_dir` (default: cwd) for each input.
+
+        `output_dir` is created if it does not exist. Raises ValueError if two inputs
+        would be written to the same file, e.g. `a/doc.html` and `b/doc.htm`.
+        """
+        output_paths = [str(Path(output_dir or '.') / (Path(input_file).stem + '_chunks.json'))
+                        for input_file in input_files]
+        seen = {}
+        for input_file, output_path in zip(input_files, output_paths):
+            key = Path(output_path).resolve()
+            if key in seen:
+                raise ValueError(f"{seen[key]} and {input_file} would both be written to {output_path}")
+            seen[key] = input_file
+        if output_dir:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+        return output_paths
+
+    def process_files(self, input_files: List[str], workers: int = None,
+                      output_dir: str = None) -> List[str]:
+        """Split several HTML files in parallel across a pool of processes.
+
+        Each file is written to `<stem>_chunks.json` in `output_dir` (default: the
+        current directory); inputs that would share an output file are rejected
+        before any work starts. `workers` defaults to the number of CPUs. Returns
+        the output files in input order.
+        """
+        output_files = self.chunk_output_paths(input_files, output_dir)
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            return list(executor.map(self.process_file, input_files, output_files))
+
+    @staticmethod
+    def _read_chars(input_path: Path, start: int, end: int, block_size: int) -> str:
+        """Re-read characters `start` to `end` of a file decoded as `process_file_streaming` reads it."""
+        with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
+            while start:
+                skipped = len(f.read(min(start, block_size)))
+                start -= skipped
+                end -= skipped
+            return f.read(end)
+
+    def process_file_streaming(self, input_file: str, output_file: str = None,
+                               block_size: int = 8192, max_head_size: int = 1 << 20) -> str:
+        """Split HTML file and write JSON chunks without holding the whole file in memory.
+
+        The file is read in blocks of `block_size` characters and chunk content is
+        written to the JSON output as soon as it is known, so peak memory stays close
+        to the block size. Produces the same chunks and metadata as `process_file`.
+        Tags are assumed not to contain a literal '<' and to end at their first '>',
+        so only an unclosed tag at the end of a block is held back until the next
+        block arrives. A `<head>` longer
+        than `max_head_size` characters is not buffered but re-read once it closes.
+        """
+        input_path = self._check_input_file(input_file)
 
-        output_data = {
-            'metadata': {
+        if output_file is None:
+            output_file = input_path.stem + '_chunks.json'
+
+        with open(input_path, 'r', encoding='utf-8', errors='ignore') as src, \
+                open(output_file, 'w', encoding='utf-8') as out:
+
+            def write_content(text):
+                out.write(json.dumps(text, ensure_ascii=False)[1:-1])
+
+            def close_chunk(page_num, break_info):
+                out.write('", "has_break_before": ' + json.dumps(page_num > 1) +
+                          ', "break_element_info": ' + json.dumps(break_info, ensure_ascii=False) + '}')
+
+            out.write('{"chunks": [\n{"page": 1, "content": "')
+            page_num = 1
+            buffer = ''
+            offset = 0  # Position of buffer[0] in the whole document
+            file_size = 0
+            pending_ws = ''  # Trailing whitespace, dropped if a break follows
+            head_start = None  # Position of '<head' in the whole document
+            head_scan = ''  # Text from head_scan_pos on, searched for the <head> bounds
+            head_scan_pos = 0
+            head_content = None
+
+            while True:
+                block = src.read(block_size)
+                file_size += len(block)
+                buffer += block
+
+                # Extract <head> if present (same match as `<head.*?</head>`)
+                if head_content is None and block:
+                    # Earlier text was already searched; only a tag straddling the block edge is new
+                    search_from = max(0, len(head_scan) - len('</head'))
+                    head_scan += block
+                    if head_start is None:
+                        start = self.head_open_regex.search(head_scan, search_from)
+                        if start:
+                            head_start = head_scan_pos + start.start()
+                    if head_start is not None:
+                        end = self.head_close_regex.search(
+                            head_scan, max(search_from, head_start + len('<head') - head_scan_pos)
+                        )
+                        if end:
+                            if head_start >= head_scan_pos:
+                                head_content = head_scan[head_start - head_scan_pos:end.end()]
+                            else:
+                                head_content = self._read_chars(
+                                    input_path, head_start, head_scan_pos + end.end(), block_size
+                                )
+                            head_scan = ''
+                    if head_content is None and (head_start is None or len(head_scan) > max_head_size):
+                        # Keep only the tail that may hold the start of a tag
+                        drop = max(0, len(head_scan) - len('</head'))
+                        head_scan_pos += drop
+                        head_scan = head_scan[drop:]
+
+                # Hold back the last tag of the buffer only while it is still open
+                limit = buffer.rfind('<') if block else -1
+                if limit == -1 or buffer.find('>', limit) != -1:
+                    limit = len(buffer)
+
+                pos = 0
+                for break_pos, break_text in self._break_positions(
+                        buffer, self.break_word_regex, self.tag_pattern, limit):
+                    text = buffer[pos:break_pos].rstrip(' \t\r\n')
+                    if text:
+                        write_content(pending_ws + text)
+                    pending_ws = ''
+                    close_chunk(page_num, {
+                        'break_text': break_text[:200],
+                        'position': offset + break_pos
+                    })
+                    page_num += 1
+                    out.write(',\n{"page": ' + str(page_num) + ', "content": "')
+                    pos = break_pos
+
+                text = buffer[pos:limit]
+                stripped = text.rstrip(' \t\r\n')
+                if stripped:
+                    write_content(pending_ws + stripped)
+                    pending_ws = text[len(stripped):]
+                else:
+                    pending_ws += text
+
+                buffer = buffer[limit:]
+                offset += limit
+                if not block:
+                    break
+
+            # Final chunk keeps its trailing whitespace
+            write_content(pending_ws)
+            close_chunk(page_num, 'Final chunk' if page_num > 1 else 'No breaks found')
+
+            metadata = {
                 'original_file': str(input_path),
-                'total_pages': len(chunks),
+                'total_pages': page_num,
                 'file_size': file_size,
                 'parsing_method': 'regex',
-                'head_content': head_content
-            },
-            'chunks': chunks
-        }
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+                'head_content': head_content or ""
+            }
+            out.write('\n],\n"metadata": ' + json.dumps(metadata, ensure_ascii=False) + '}\n')
 
         return output_file
 
@@ -154,40 +514,68 @@ class HTMLPageBreakSplitter:
         if not json_path.exists():
             raise FileNotFoundError(f"JSON file not found: {json_file}")
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(json_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
 
         if output_file is None:
             original_name = Path(data['metadata']['original_file']).stem
             output_file = f"{original_name}_reconstructed.html"
 
-        html_content = ""
         sorted_chunks = sorted(data['chunks'], key=lambda x: x['page'])
 
-        for chunk in sorted_chunks:
-            html_content += chunk['content']
-
+        # Write chunk by chunk instead of concatenating the whole document first
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            for chunk in sorted_chunks:
+                f.write(chunk['content'])
 
         return output_file
 
 
 def main():
     parser = argparse.ArgumentParser(description='Split HTML files based on page breaks')
-    parser.add_argument('input_file', help='HTML/HTM input file or JSON for reconstruction')
-    parser.add_argument('-o', '--output', help='Output filename')
+    parser.add_argument('input_files', nargs='+', metavar='input_file',
+                        help='HTML/HTM input file(s) or JSON for reconstruction')
+    parser.add_argument('-o', '--output', help='Output filename (single input only)')
     parser.add_argument('-r', '--reconstruct', action='store_true', help='Reconstruct from JSON')
+    parser.add_argument('-s', '--stream', action='store_true',
+                        help='Read the HTML file in blocks instead of loading it whole')
+    parser.add_argument('-d', '--output-dir',
+                        help='Directory for the JSON files of several inputs (default: current directory)')
+    parser.add_argument('-j', '--workers', type=int,
+                        help='Processes used to split several files (default: CPU count)')
+    parser.add_argument('--re2', action='store_true',
+                        help='Scan for styled tags with RE2 (requires google-re2)')
     args = parser.parse_args()
 
-    splitter = HTMLPageBreakSplitter()
+    if args.output and len(args.input_files) > 1:
+        parser.error('-o/--output can only be used with a single input file, use -d/--output-dir')
+    if args.re2 and re2 is None:
+        parser.error('--re2 requires google-re2')
+
+    splitter = HTMLPageBreakSplitter(use_re2=args.re2)
 
     try:
         if args.reconstruct:
-            out_file = splitter.reconstruct_file(args.input_file, args.output)
-            print(f"Reconstructed HTML file: {out_file}")
+            for input_file in args.input_files:
+                out_file = splitter.reconstruct_file(input_file, args.output)
+                print(f"Reconstructed HTML file: {out_file}")
+        elif args.stream:
+            output_files = [args.output] if args.output else \
+                splitter.chunk_output_paths(args.input_files, args.output_dir)
+            for input_file, output_file in zip(args.input_files, output_files):
+                out_file = splitter.process_file_streaming(input_file, output_file)
+                print(f"Created JSON chunks file: {out_file}")
+        elif len(args.input_files) > 1:
+            for out_file in splitter.process_files(args.input_files, args.workers, args.output_dir):
+                print(f"Created JSON chunks file: {out_file}")
         else:
-            out_file = splitter.process_file(args.input_file, args.output)
+            output_file = args.output or \
+                splitter.chunk_output_paths(args.input_files, args.output_dir)[0]
+            out_file = splitter.process_file(args.input_files[0], output_file)
             print(f"Created JSON chunks file: {out_file}")
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
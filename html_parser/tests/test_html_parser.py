@@ -1,7 +1,13 @@
 import pytest
+import functools
 from pathlib import Path
+import src.html_regex_page_splitter as html_regex_page_splitter
 from src.html_regex_page_splitter import HTMLPageBreakSplitter
 import shutil
+import json
+import copy
+import pickle
+import tracemalloc
 
 # Folder containing test HTML files
 TEST_DATA_DIR = Path(__file__).parent / "data"
@@ -23,13 +29,35 @@ def html_file(request):
     return request.param
 
 
+@functools.lru_cache(maxsize=None)
+def _split_cached(path: str, mtime: int, size: int) -> tuple:
+    """Read and split a test file once; `mtime` and `size` only invalidate the cache."""
+    html_content = Path(path).read_text(encoding="utf-8", errors="ignore")
+    return html_content, tuple(HTMLPageBreakSplitter().split_html_by_regex(html_content))
+
+
+def split_cached(html_file: Path) -> tuple:
+    """Return `(html_content, chunks)` for a test file, shared between tests."""
+    stat = html_file.stat()
+    return _split_cached(str(html_file.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
 def test_split_html_by_regex_basic(splitter, html_file):
     """Test basic splitting functionality on each file."""
     html_content = html_file.read_text(encoding="utf-8", errors="ignore")
     chunks = splitter.split_html_by_regex(html_content)
     assert isinstance(chunks, list)
     assert len(chunks) > 0, "Should find at least one chunk"
-    assert all('content' in chunk and 'page' in chunk for chunk in chunks)
+    assert all(hasattr(chunk, 'content') and hasattr(chunk, 'page') for chunk in chunks)
+
+
+def test_split_html_by_regex_offsets(splitter, html_file):
+    """Offsets must slice out exactly the chunks returned by split_html_by_regex."""
+    html_content, chunks = split_cached(html_file)
+    offsets = splitter.split_html_by_regex_offsets(html_content)
+    assert list(offsets['pages']) == [chunk.page for chunk in chunks]
+    assert [html_content[start:end] for start, end in zip(offsets['starts'], offsets['ends'])] == \
+        [chunk.content for chunk in chunks]
 
 
 def test_process_file_and_reconstruct(splitter, html_file):
@@ -87,13 +115,148 @@ def test_process_file_and_reconstruct(splitter, html_file):
             reconstructed_html_file.unlink()
 
 
+def test_split_file_matches_split_html_by_regex(splitter, html_file):
+    """Splitting through mmap must give the same chunks as splitting the decoded text."""
+    html_content, expected = split_cached(html_file)
+    file_size, _, chunks = splitter.split_file(str(html_file))
+    assert file_size == len(html_content)
+    assert chunks == list(expected)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_reconstruct_file_joins_chunks(splitter, html_file, tmp_path, monkeypatch, use_orjson):
+    """reconstruct_file must write the chunk contents of process_file's JSON back in page order."""
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(html_regex_page_splitter, "orjson", None)
+
+    json_file = splitter.process_file(str(html_file), str(tmp_path / "chunks.json"))
+    reconstructed_file = splitter.reconstruct_file(json_file, str(tmp_path / "reconstructed.html"))
+
+    _, _, chunks = splitter.split_file(str(html_file))
+    with open(reconstructed_file, encoding="utf-8", newline="") as f:
+        assert f.read() == "".join(chunk.content for chunk in chunks)
+
+
+def test_process_file_streaming_matches_process_file(splitter, html_file, tmp_path):
+    """Streaming split must produce the same JSON data as the in-memory split."""
+    in_memory_json = splitter.process_file(str(html_file), str(tmp_path / "in_memory.json"))
+    streamed_json = splitter.process_file_streaming(str(html_file), str(tmp_path / "streamed.json"))
+
+    with open(in_memory_json, encoding="utf-8") as f:
+        expected = json.load(f)
+    with open(streamed_json, encoding="utf-8") as f:
+        streamed = json.load(f)
+
+    assert streamed == expected
+
+
+def test_process_files_matches_process_file(splitter, tmp_path, monkeypatch):
+    """Splitting several files in parallel must write the same JSON as one at a time."""
+    monkeypatch.chdir(tmp_path)
+    html_files = sorted(TEST_DATA_DIR.glob("*.htm*"))
+    output_files = splitter.process_files([str(path) for path in html_files], workers=2)
+    assert output_files == [f"{path.stem}_chunks.json" for path in html_files]
+
+    for html_file, output_file in zip(html_files, output_files):
+        expected_json = splitter.process_file(str(html_file), str(tmp_path / "expected.json"))
+        with open(expected_json, encoding="utf-8") as f:
+            expected = json.load(f)
+        with open(output_file, encoding="utf-8") as f:
+            assert json.load(f) == expected
+
+
+def test_process_files_rejects_shared_output(splitter, tmp_path):
+    """Inputs with the same stem must not be written to the same JSON file."""
+    for folder, name in (("a", "doc.html"), ("b", "doc.htm")):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / name).write_text("<html><body>Text</body></html>", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        splitter.process_files([str(tmp_path / "a" / "doc.html"), str(tmp_path / "b" / "doc.htm")],
+                               output_dir=str(tmp_path))
+    assert not (tmp_path / "doc_chunks.json").exists()
+
+
+def test_process_files_creates_output_dir(splitter, tmp_path):
+    """A missing output directory is created before the workers write to it."""
+    html_file = tmp_path / "doc.html"
+    html_file.write_text("<html><body>Text</body></html>", encoding="utf-8")
+    output_dir = tmp_path / "out" / "nested"
+
+    output_files = splitter.process_files([str(html_file)], workers=1, output_dir=str(output_dir))
+    assert output_files == [str(output_dir / "doc_chunks.json")]
+    assert (output_dir / "doc_chunks.json").exists()
+
+
+@pytest.mark.parametrize("html", [
+    "<html><HEAD><title>" + "x" * 300 + "</title></Head><body>Text</body></html>",
+    "<html><header>" + "x" * 300 + "</header><p>No head element closes here</p></html>",
+])
+def test_process_file_streaming_head(splitter, html, tmp_path):
+    """The <head> found while streaming in small blocks must match process_file."""
+    html_file = tmp_path / "doc.html"
+    html_file.write_text(html, encoding="utf-8")
+    in_memory_json = splitter.process_file(str(html_file), str(tmp_path / "in_memory.json"))
+    streamed_json = splitter.process_file_streaming(
+        str(html_file), str(tmp_path / "streamed.json"), block_size=7, max_head_size=50
+    )
+
+    with open(in_memory_json, encoding="utf-8") as f:
+        expected = json.load(f)
+    with open(streamed_json, encoding="utf-8") as f:
+        assert json.load(f) == expected
+
+
+def test_re2_tag_scan_matches_re(splitter, html_file):
+    """The opt-in RE2 tag scan must find the same chunks as re."""
+    pytest.importorskip("re2")
+    html_content, expected = split_cached(html_file)
+    re2_splitter = HTMLPageBreakSplitter(use_re2=True)
+    assert re2_splitter.split_html_by_regex(html_content) == list(expected)
+    assert re2_splitter.split_file(str(html_file))[2] == list(expected)
+
+
+def test_chunk_pickle_and_copy(splitter):
+    """Chunks must survive pickling (e.g. from a worker process) and copying."""
+    html = '<p>Intro</p><div style="page-break-before:always">Page 2</div>'
+    chunks = splitter.split_html_by_regex(html)
+    assert pickle.loads(pickle.dumps(chunks)) == chunks
+    assert [copy.copy(chunk) for chunk in chunks] == chunks
+    assert copy.deepcopy(chunks) == chunks
+
+
+def test_process_file_streaming_long_text_stays_bounded(splitter, tmp_path):
+    """A text run spanning many blocks must not accumulate in the streaming buffer."""
+    html_file = tmp_path / "doc.html"
+    html_file.write_text("<html><body><p>" + "word " * 200_000 + "</p>"
+                         '<div style="page-break-before:always">Page 2</div></body></html>',
+                         encoding="utf-8")
+
+    tracemalloc.start()
+    try:
+        streamed_json = splitter.process_file_streaming(str(html_file), str(tmp_path / "streamed.json"),
+                                                        block_size=4096)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 256 * 1024, f"peak {peak} bytes for a 1 MB file"
+
+    expected_json = splitter.process_file(str(html_file), str(tmp_path / "in_memory.json"))
+    with open(expected_json, encoding="utf-8") as f:
+        expected = json.load(f)
+    with open(streamed_json, encoding="utf-8") as f:
+        assert json.load(f) == expected
+
+
 def test_no_breaks_file(splitter):
     """Test a file with no explicit page breaks."""
     no_break_html = "<html><body><p>This is a single page document.</p></body></html>"
     chunks = splitter.split_html_by_regex(no_break_html)
     assert len(chunks) == 1
-    assert chunks[0]['page'] == 1
-    assert "This is a single page document." in chunks[0]['content']
+    assert chunks[0].page == 1
+    assert "This is a single page document." in chunks[0].content
 
 
 def test_break_avoidance(splitter):
@@ -108,6 +271,30 @@ def test_break_avoidance(splitter):
     chunks = splitter.split_html_by_regex(html_with_avoid)
     # Expecting 3 chunks: initial + Page 1 + Page 2
     assert len(chunks) == 3
-    assert "Page 1" in chunks[1]['content']
-    assert "This should not break" in chunks[1]['content'] or "This should not break" in chunks[2]['content']
-    assert "Page 2" in chunks[2]['content']
+    assert "Page 1" in chunks[1].content
+    assert "This should not break" in chunks[1].content or "This should not break" in chunks[2].content
+    assert "Page 2" in chunks[2].content
+
+
+@pytest.mark.parametrize("other_attribute", ['data-style="color:red"', 'mystyle="color:red"'])
+def test_break_style_followed_by_style_like_attribute(splitter, other_attribute, tmp_path):
+    """Only the real style attribute is checked, even if a later attribute name ends in 'style'."""
+    html = f'<p>Intro</p><div style="page-break-before:always" class="x" {other_attribute}>Page 2</div>'
+    chunks = splitter.split_html_by_regex(html)
+    assert len(chunks) == 2
+    assert chunks[1].content.startswith('<div style="page-break-before:always"')
+
+    html_file = tmp_path / "doc.html"
+    html_file.write_text(html, encoding="utf-8")
+    assert splitter.split_file(str(html_file))[2] == chunks
+
+
+def test_non_ascii_space_in_style_is_not_css_whitespace(splitter, tmp_path):
+    """U+00A0 is not CSS whitespace; the str and mmap paths must both ignore the property."""
+    html = '<p>Intro</p><div style="page-break-before:\xa0always">Page 2</div>'
+    chunks = splitter.split_html_by_regex(html)
+    assert len(chunks) == 1
+
+    html_file = tmp_path / "doc.html"
+    html_file.write_text(html, encoding="utf-8")
+    assert splitter.split_file(str(html_file))[2] == chunks